@@ -1,5 +1,6 @@
 import weaviate
 from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from utils import EMBED_MODEL
 
 client = weaviate.connect_to_local()
 
@@ -14,10 +15,12 @@ if not client.collections.exists("Chunks"):
             Property(name="chunk", data_type=DataType.TEXT),
             Property(name="chunk_no", data_type=DataType.INT),
             Property(name="path", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+            Property(name="chunk_hash", data_type=DataType.TEXT, tokenization=Tokenization.FIELD, index_searchable=False),
         ],
         vector_config=Configure.Vectors.text2vec_cohere(
-            model="embed-v4.0",
-            source_properties=["chunk", "path"]
+            model=EMBED_MODEL,
+            source_properties=["chunk", "path"],
+            vectorize_collection_name=False,
         )
     )
 
@@ -27,11 +30,15 @@ if not client.collections.exists("Documents"):
         properties=[
             Property(name="product", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
             Property(name="body", data_type=DataType.TEXT),
+            # Returned by document searches instead of the full body; not searchable so ranking is unchanged
+            Property(name="body_preview", data_type=DataType.TEXT, index_searchable=False),
+            Property(name="body_hash", data_type=DataType.TEXT, tokenization=Tokenization.FIELD, index_searchable=False),
             Property(name="path", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
         ],
         vector_config=Configure.Vectors.text2vec_cohere(
-            model="embed-v4.0",
-            source_properties=["path"]
+            model=EMBED_MODEL,
+            source_properties=["path"],
+            vectorize_collection_name=False,
         )
     )
 
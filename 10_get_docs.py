@@ -1,6 +1,6 @@
 import asyncio
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BFSDeepCrawlStrategy, LXMLWebScrapingStrategy, URLPatternFilter, DomainFilter, FilterChain, CacheMode
-import json
+import orjson
 from pathlib import Path
 from typing import Optional
 from utils import CRAWLED_DOCS_DIR
@@ -9,8 +9,12 @@ from utils import CRAWLED_DOCS_DIR
 crawled_docs_dir = Path(CRAWLED_DOCS_DIR)
 crawled_docs_dir.mkdir(parents=True, exist_ok=True)
 
+# Jobs crawl independent domains, so run a few at once on a shared browser
+# (each job also fetches up to `semaphore_count` pages concurrently)
+MAX_CONCURRENT_JOBS = 3
 
-async def crawl_docs(name: str, allowed_domains: list[str], start_url: str, url_pattern: Optional[str] = None):
+
+async def crawl_docs(crawler: AsyncWebCrawler, name: str, allowed_domains: list[str], start_url: str, url_pattern: Optional[str] = None) -> dict[str, Optional[str]]:
     print(f"Crawling {name}...")
 
     # Create a filter chain for the crawler
@@ -30,17 +34,29 @@ async def crawl_docs(name: str, allowed_domains: list[str], start_url: str, url_
             ),
             scraping_strategy=LXMLWebScrapingStrategy(),
             verbose=True,
+            # Pages are cached in crawl4ai's on-disk database and reused on later runs,
+            # so repeat crawls don't re-download them (use CacheMode.BYPASS to refresh)
             cache_mode=CacheMode.ENABLED,
             semaphore_count=3,
+            stream=True,
         )
 
-    # Run the crawler
-    async with AsyncWebCrawler() as crawler:
-        results = await crawler.arun(start_url, config=config)
+    # Run the crawler, streaming results and keeping only each page's markdown as a
+    # plain string, so full crawl results (HTML, links, markdown variants) never pile up
+    results_md = {}
+    async for result in await crawler.arun(start_url, config=config):
+        results_md[result.url] = str(result.markdown) if result.markdown is not None else None
+
+    print(f"Crawled {len(results_md)} {name} pages in total")
+
+    return results_md
 
-        print(f"Crawled {len(results)} pages in total")
 
-    return results
+async def crawl_job(crawler: AsyncWebCrawler, semaphore: asyncio.Semaphore, job: dict):
+    async with semaphore:
+        results_md = await crawl_docs(crawler, **job)
+
+    (crawled_docs_dir / f"{job['name']}_crawl4ai.json").write_bytes(orjson.dumps(results_md))
 
 
 async def main():
@@ -90,14 +106,17 @@ async def main():
         }
     ]
 
-    for job in jobs:
-        results = await crawl_docs(**job)
-        results_md = {}
-        for result in results:
-            results_md[result.url] = result.markdown
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+    async with AsyncWebCrawler() as crawler:
+        # Let every job finish before the shared browser closes, even if one fails
+        results = await asyncio.gather(
+            *[crawl_job(crawler, semaphore, job) for job in jobs],
+            return_exceptions=True,
+        )
 
-        with open(crawled_docs_dir / f"{job['name']}_crawl4ai.json", "w") as f:
-            json.dump(results_md, f)
+    for job, result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            print(f"Error crawling {job['name']}: {result}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import asyncio
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, LXMLWebScrapingStrategy, CacheMode
-import json
+import orjson
+import re
 from pathlib import Path
 from typing import Optional
 from utils import CRAWLED_DOCS_DIR, PROCESSED_DOCS_DIR
@@ -10,6 +11,32 @@ crawled_docs_dir = Path(CRAWLED_DOCS_DIR)
 processed_docs_dir = Path(PROCESSED_DOCS_DIR)
 processed_docs_dir.mkdir(parents=True, exist_ok=True)
 
+# Retries (across all files) share one browser; this caps how many pages it has open at once
+MAX_CONCURRENT_RETRIES = 5
+
+# Common security challenge indicators
+SECURITY_INDICATORS = [
+    "Just a moment...",
+    "Enable JavaScript and cookies to continue",
+    "Please enable cookies",
+    "Checking your browser",
+    "Access denied",
+    "403 Forbidden",
+    "404 Not Found",
+    "500 Internal Server Error",
+    "Ray ID:",
+    "Please verify you are a human",
+    "Security check",
+    "captcha",
+]
+
+# A single case-insensitive pass finds any indicator, rather than lowercasing
+# the whole page and scanning it once per indicator
+SECURITY_INDICATOR_PATTERN = re.compile(
+    "|".join(re.escape(indicator) for indicator in SECURITY_INDICATORS),
+    re.IGNORECASE,
+)
+
 
 def is_problematic_content(content: str) -> bool:
     """
@@ -24,48 +51,30 @@ def is_problematic_content(content: str) -> bool:
     if len(content.strip()) < 50:
         return True
 
-    # Check for common security challenge indicators
-    security_indicators = [
-        "Just a moment...",
-        "Enable JavaScript and cookies to continue",
-        "Please enable cookies",
-        "Checking your browser",
-        "Access denied",
-        "403 Forbidden",
-        "404 Not Found",
-        "500 Internal Server Error",
-        "Ray ID:",
-        "Please verify you are a human",
-        "Security check",
-        "captcha",
-        "CAPTCHA"
-    ]
-
-    content_lower = content.lower()
-    for indicator in security_indicators:
-        if indicator.lower() in content_lower:
-            print(f"    ⚠️  Found security indicator: {indicator}")
-            return True
+    match = SECURITY_INDICATOR_PATTERN.search(content)
+    if match:
+        print(f"    ⚠️  Found security indicator: {match.group(0)}")
+        return True
 
     return False
 
 
-async def retry_scrape_url(url: str) -> Optional[str]:
+async def retry_scrape_url(url: str, crawler: AsyncWebCrawler, semaphore: asyncio.Semaphore) -> Optional[str]:
     """
     Retry scraping a specific URL with basic configuration.
 
+    Reuses the given crawler so the browser is only started once.
     Returns the markdown content if successful, None otherwise.
     """
-    print(f"  Retrying scrape for: {url}")
-
     config = CrawlerRunConfig(
         scraping_strategy=LXMLWebScrapingStrategy(),
         verbose=False,
         cache_mode=CacheMode.BYPASS,  # Bypass cache to get fresh content
     )
 
-    try:
-        async with AsyncWebCrawler() as crawler:
+    async with semaphore:
+        print(f"  Retrying scrape for: {url}")
+        try:
             result = await crawler.arun(url, config=config)
 
             if result and len(result) > 0:
@@ -73,21 +82,21 @@ async def retry_scrape_url(url: str) -> Optional[str]:
 
                 # Check if the retry also failed
                 if is_problematic_content(markdown):
-                    print(f"    ⚠️  Retry also returned problematic content")
+                    print(f"    ⚠️  Retry also returned problematic content for {url}")
                     return None
 
-                print(f"    ✓ Successfully re-scraped")
+                print(f"    ✓ Successfully re-scraped {url}")
                 return markdown
             else:
-                print(f"    ✗ Retry failed - no results")
+                print(f"    ✗ Retry failed - no results for {url}")
                 return None
 
-    except Exception as e:
-        print(f"    ✗ Retry failed with error: {e}")
-        return None
+        except Exception as e:
+            print(f"    ✗ Retry failed for {url} with error: {e}")
+            return None
 
 
-async def process_file(input_file: Path) -> dict:
+async def process_file(input_file: Path, crawler: AsyncWebCrawler, semaphore: asyncio.Semaphore) -> dict:
     """
     Process a single JSON file, identifying and retrying problematic URLs.
 
@@ -95,8 +104,7 @@ async def process_file(input_file: Path) -> dict:
     """
     print(f"\nProcessing {input_file.name}...")
 
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    data = orjson.loads(input_file.read_bytes())
 
     total_urls = len(data)
     problematic_urls = []
@@ -106,20 +114,21 @@ async def process_file(input_file: Path) -> dict:
         if is_problematic_content(content):
             problematic_urls.append(url)
 
-    print(f"  Found {len(problematic_urls)} problematic URLs out of {total_urls} total")
+    print(f"  {input_file.name}: found {len(problematic_urls)} problematic URLs out of {total_urls} total")
 
     if not problematic_urls:
-        print(f"  ✓ No issues found, copying as-is")
+        print(f"  ✓ {input_file.name}: no issues found, copying as-is")
         return data
 
-    # Second pass: retry scraping problematic URLs
-    retry_count = 0
-    success_count = 0
+    # Second pass: retry scraping problematic URLs concurrently
+    new_contents = await asyncio.gather(*[
+        retry_scrape_url(url, crawler, semaphore) for url in problematic_urls
+    ])
 
-    for url in problematic_urls:
-        retry_count += 1
-        new_content = await retry_scrape_url(url)
+    retry_count = len(problematic_urls)
+    success_count = 0
 
+    for url, new_content in zip(problematic_urls, new_contents):
         if new_content:
             data[url] = new_content
             success_count += 1
@@ -127,11 +136,21 @@ async def process_file(input_file: Path) -> dict:
             # Keep the original (problematic) content
             print(f"    Keeping original content for {url}")
 
-    print(f"  Summary: Retried {retry_count} URLs, successfully fixed {success_count}")
+    print(f"  {input_file.name} summary: Retried {retry_count} URLs, successfully fixed {success_count}")
 
     return data
 
 
+async def process_and_save(input_file: Path, crawler: AsyncWebCrawler, semaphore: asyncio.Semaphore):
+    processed_data = await process_file(input_file, crawler, semaphore)
+
+    # Save to processed directory
+    output_file = processed_docs_dir / input_file.name
+    output_file.write_bytes(orjson.dumps(processed_data))
+
+    print(f"  ✓ Saved to {output_file.name}")
+
+
 async def main():
     """
     Main function to process all crawled documentation files.
@@ -149,16 +168,13 @@ async def main():
 
     print(f"\nFound {len(json_files)} files to process")
 
-    # Process each file
-    for input_file in json_files:
-        processed_data = await process_file(input_file)
-
-        # Save to processed directory
-        output_file = processed_docs_dir / input_file.name
-        with open(output_file, 'w') as f:
-            json.dump(processed_data, f, indent=2)
-
-        print(f"  ✓ Saved to {output_file.name}")
+    # Process all files concurrently, sharing one crawler (and browser) and one
+    # retry limit across them
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RETRIES)
+    async with AsyncWebCrawler() as crawler:
+        await asyncio.gather(*[
+            process_and_save(input_file, crawler, semaphore) for input_file in json_files
+        ])
 
     print("\n✓ All files processed successfully!")
 
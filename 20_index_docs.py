@@ -1,71 +1,353 @@
+import asyncio
+import hashlib
+from uuid import UUID
 import weaviate
-from weaviate.util import generate_uuid5
-import json
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter
+import ijson
+import orjson
 from chonkie import TokenChunker
 import os
-from tqdm import tqdm
-from utils import PROCESSED_DOCS_DIR
+from utils import PROCESSED_DOCS_DIR, CHUNKED_DOCS_DIR, BODY_PREVIEW_CHARS, document_uuid
 from pathlib import Path
 
 
 doc_files_dir = Path(PROCESSED_DOCS_DIR)
+chunked_docs_dir = Path(CHUNKED_DOCS_DIR)
+chunked_docs_dir.mkdir(parents=True, exist_ok=True)
 
+# Ingest is bound by round trips to Weaviate (and Cohere behind it), not CPU,
+# so index several files at once and let their requests overlap
+MAX_CONCURRENT_FILES = 4
+# Weaviate vectorizes each insert request server-side, grouping its objects into
+# as few Cohere embed calls as possible - so larger slices mean fewer round trips
+INSERT_SLICE_SIZE = 500
+# Pages read, chunked and sent per step; the tokenizer encodes each batch in one go
+CHUNK_BATCH_SIZE = 64
+# Chunking (CPU) and inserting (network) run as a pipeline: per file, one producer
+# chunks batches in a worker thread while these consumers send finished batches
+INSERT_WORKERS = 2
+# Batches waiting to be sent; bounded so chunking can't run far ahead of the network
+INSERT_QUEUE_SIZE = 4
 
-chunker = TokenChunker(
-    tokenizer="word", # Default tokenizer (or use "gpt2", etc.)
-    chunk_size=512, # Maximum tokens per chunk
-    chunk_overlap=128 # Overlap between chunks
-)
-
-
-client = weaviate.connect_to_local(
-    headers={
-        "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY")
-    },
-)
-
-crawled_doc_paths = doc_files_dir.glob("*.json")
-
-chunks = client.collections.use("Chunks")
-documents = client.collections.use("Documents")
-
-for crawled_doc_path in crawled_doc_paths:
-    vdb_name = crawled_doc_path.stem.split("_")[0]
-    crawled_doc_dict = json.loads(crawled_doc_path.read_text())
-    print(f"Indexing {vdb_name} docs, containing {len(crawled_doc_dict)} pages")
-
-    print("Indexing chunks...")
-    with chunks.batch.fixed_size(batch_size=50) as batch:
-        for path, text in tqdm(crawled_doc_dict.items()):
-            try:
-                text_chunks = chunker.chunk(text)
-                if len(text_chunks) == 0:
-                    continue
-
-                for i, text_chunk in enumerate(text_chunks):
-                    batch.add_object(
-                        properties={
-                            "product": vdb_name,
-                            "chunk": text_chunk.text,
-                            "chunk_no": i,
-                            "path": path
-                        },
-                        uuid=generate_uuid5("Chunks", f"{vdb_name}-{path}-chunk-{i}")
-                    )
-            except Exception as e:
-                print(f"Error ingesting {path}: {e}")
-
-
-    print("Indexing documents...")
-    with documents.batch.fixed_size(batch_size=50) as batch:
-        for path, text in tqdm(crawled_doc_dict.items()):
-            batch.add_object(
+
+CHUNKER_SETTINGS = {
+    "tokenizer": "gpt2", # Rust-backed tokenizer, supports batch encoding
+    "chunk_size": 512, # Maximum tokens per chunk
+    "chunk_overlap": 128, # Overlap between chunks
+}
+
+
+def make_chunker() -> TokenChunker:
+    # One per file: files are chunked in parallel worker threads, and the chunker
+    # makes no thread-safety guarantees
+    return TokenChunker(**CHUNKER_SETTINGS)
+
+
+async def insert_in_slices(collection, objects: list[DataObject]) -> set[str]:
+    """Insert the objects, returning the paths of any that failed."""
+    failed_paths = set()
+    for i in range(0, len(objects), INSERT_SLICE_SIZE):
+        response = await collection.data.insert_many(objects[i:i + INSERT_SLICE_SIZE])
+        for error in response.errors.values():
+            print(f"Error ingesting {error.object_.properties['path']}: {error.message}")
+            failed_paths.add(error.object_.properties["path"])
+    return failed_paths
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def chunk_uuid(vdb_name: str, path: str, chunk_hash: str) -> UUID:
+    # Deterministic per (product, page, chunk content): a chunk shared by several pages
+    # or products is stored under each, so product and path filters still find it
+    return UUID(hex=content_hash(f"{vdb_name}\n{path}\n{chunk_hash}"))
+
+
+def chunk_cache_path(crawled_doc_path: Path) -> Path:
+    # Chunks made with other chunker settings live in another file, so they're never reused
+    settings_hash = content_hash(orjson.dumps(CHUNKER_SETTINGS, option=orjson.OPT_SORT_KEYS).decode())[:8]
+    return chunked_docs_dir / f"{crawled_doc_path.stem}.{settings_hash}.jsonl"
+
+
+class ChunkCache:
+    """
+    Chunks of every page in a crawl file, kept as JSONL so unchanged pages are never re-chunked.
+
+    Only path -> body_hash (and where the page's rows sit in the old file) is held in memory.
+    Chunk text is read back per page, and the new cache is written as pages stream past.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self.tmp_path = cache_path.with_suffix(".tmp")
+        # path -> (body_hash, offset, length) of the page's rows in the old file
+        self.index: dict[str, tuple[str, int, int]] = {}
+        self.old_file = None
+        if cache_path.exists():
+            self.old_file = open(cache_path, "rb")
+            offset = 0
+            for line in self.old_file:
+                # A page's rows are written together, so they form one contiguous span
+                row = orjson.loads(line)
+                body_hash, start, length = self.index.get(row["path"], (row["body_hash"], offset, 0))
+                self.index[row["path"]] = (body_hash, start, length + len(line))
+                offset += len(line)
+        # Written to a temporary file first so an interrupted run never leaves a truncated cache
+        self.new_file = open(self.tmp_path, "wb")
+
+    def body_hash(self, path: str) -> str | None:
+        cached = self.index.get(path)
+        return cached[0] if cached else None
+
+    def _read_rows(self, path: str) -> bytes:
+        _, offset, length = self.index[path]
+        self.old_file.seek(offset)
+        return self.old_file.read(length)
+
+    def get(self, path: str) -> list[tuple[str, str]]:
+        rows = [orjson.loads(line) for line in self._read_rows(path).splitlines()]
+        return [(row["chunk_hash"], row["chunk"]) for row in rows]
+
+    def keep(self, path: str):
+        # Carry the page's old rows over as they are; pages no longer crawled are never kept
+        if path in self.index:
+            self.new_file.write(self._read_rows(path))
+
+    def put(self, path: str, body_hash: str, page_chunks: list[tuple[str, str]]):
+        for chunk_no, (chunk_hash, text) in enumerate(page_chunks):
+            self.new_file.write(orjson.dumps(
+                {"path": path, "body_hash": body_hash, "chunk_no": chunk_no, "chunk_hash": chunk_hash, "chunk": text},
+                option=orjson.OPT_APPEND_NEWLINE,
+            ))
+
+    def close(self, save: bool):
+        if self.old_file:
+            self.old_file.close()
+        self.new_file.close()
+        if save:
+            self.tmp_path.replace(self.cache_path)
+        else:
+            self.tmp_path.unlink()
+
+
+def find_changed_pages(
+    pages: list[tuple[str, str]],
+    indexed_body_hashes: dict[str, str],
+) -> list[tuple[str, str, str]]:
+    # Pages whose body is unchanged since they were last indexed need no chunking or embedding
+    changed_pages = []
+    for path, text in pages:
+        # Failed scrapes may have no markdown at all - those chunk to nothing
+        text = text or ""
+        body_hash = content_hash(text)
+        if indexed_body_hashes.get(path) != body_hash:
+            changed_pages.append((path, text, body_hash))
+    return changed_pages
+
+
+def build_objects(
+    vdb_name: str,
+    paths: list[str],
+    changed_pages: list[tuple[str, str, str]],
+    chunk_cache: ChunkCache,
+    chunker: TokenChunker,
+) -> tuple[list[DataObject], list[DataObject]]:
+    # Pages chunked by an earlier run (e.g. before a database reset) reuse those chunks
+    to_chunk = [
+        (path, text, body_hash) for path, text, body_hash in changed_pages
+        if chunk_cache.body_hash(path) != body_hash
+    ]
+    new_chunks = {}
+    if to_chunk:
+        texts = [text for _, text, _ in to_chunk]
+        try:
+            all_chunks = chunker.chunk_batch(texts, batch_size=len(texts), show_progress_bar=False)
+        except Exception as e:
+            # Retry page by page, so one bad page doesn't fail the whole batch
+            print(f"Error chunking {vdb_name} pages {to_chunk[0][0]} - {to_chunk[-1][0]}, retrying one by one: {e}")
+            all_chunks = []
+            for path, text, _ in to_chunk:
+                try:
+                    all_chunks.append(chunker.chunk(text))
+                except Exception as e:
+                    print(f"Error chunking {path}: {e}")
+                    all_chunks.append(None)
+
+        for (path, _, _), text_chunks in zip(to_chunk, all_chunks):
+            if text_chunks is not None:
+                new_chunks[path] = [(content_hash(c.text), c.text) for c in text_chunks]
+
+    changed_by_path = {path: (text, body_hash) for path, text, body_hash in changed_pages}
+    chunk_objects = []
+    chunked_pages = []
+    for path in paths:
+        # Every crawled page goes into the new cache, in crawl order
+        if path in new_chunks:
+            page_chunks = new_chunks[path]
+            chunk_cache.put(path, changed_by_path[path][1], page_chunks)
+        else:
+            chunk_cache.keep(path)
+            if path not in changed_by_path:
+                continue
+            if chunk_cache.body_hash(path) != changed_by_path[path][1]:
+                # Chunking failed for this page; leave its document alone so the next run retries it
+                continue
+            page_chunks = chunk_cache.get(path)
+
+        text, body_hash = changed_by_path[path]
+        chunked_pages.append((path, text, body_hash))
+
+        # Repeated chunks within a page (e.g. boilerplate) only need embedding once
+        page_chunk_hashes = set()
+        for i, (chunk_hash, text) in enumerate(page_chunks):
+            if chunk_hash in page_chunk_hashes:
+                continue
+            page_chunk_hashes.add(chunk_hash)
+
+            chunk_objects.append(DataObject(
                 properties={
                     "product": vdb_name,
-                    "body": text,
-                    "path": path
+                    "chunk": text,
+                    "chunk_no": i,
+                    "path": path,
+                    "chunk_hash": chunk_hash
                 },
-                uuid=generate_uuid5("Documents", f"{vdb_name}-{path}")
+                uuid=chunk_uuid(vdb_name, path, chunk_hash)
+            ))
+
+    document_objects = [
+        DataObject(
+            properties={
+                "product": vdb_name,
+                "body": text,
+                "body_preview": text[:BODY_PREVIEW_CHARS] + "...",
+                "body_hash": body_hash,
+                "path": path
+            },
+            uuid=document_uuid(path)
+        )
+        for path, text, body_hash in chunked_pages
+    ]
+
+    return chunk_objects, document_objects
+
+
+async def insert_worker(chunks, documents, queue: asyncio.Queue):
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            return
+
+        chunk_objects, document_objects = batch
+        paths = [o.properties["path"] for o in document_objects]
+        try:
+            # Changed pages get new chunk ids, so clear out their old chunks first
+            await chunks.data.delete_many(where=Filter.by_property("path").contains_any(paths))
+            failed_paths = await insert_in_slices(chunks, chunk_objects)
+            # A document (and its body_hash) is only written once all its chunks are in,
+            # so a page whose chunks failed isn't skipped as unchanged on the next run
+            await insert_in_slices(documents, [
+                o for o in document_objects if o.properties["path"] not in failed_paths
+            ])
+        except Exception as e:
+            # Keep draining the queue so the producer never blocks on a dead consumer
+            print(f"Error inserting batch starting at {document_objects[0].properties['path']}: {e}")
+
+
+async def index_file(
+    chunks,
+    documents,
+    crawled_doc_path: Path,
+    semaphore: asyncio.Semaphore,
+    indexed_body_hashes: dict[str, str],
+):
+    async with semaphore:
+        vdb_name = crawled_doc_path.stem.split("_")[0]
+        print(f"Indexing {vdb_name} docs...")
+
+        loop = asyncio.get_running_loop()
+        chunker = make_chunker()
+        chunk_cache = await loop.run_in_executor(None, ChunkCache, chunk_cache_path(crawled_doc_path))
+
+        queue = asyncio.Queue(maxsize=INSERT_QUEUE_SIZE)
+        workers = [
+            asyncio.create_task(insert_worker(chunks, documents, queue))
+            for _ in range(INSERT_WORKERS)
+        ]
+
+        page_count = 0
+        indexed_count = 0
+
+        async def produce(pages: list[tuple[str, str]]):
+            nonlocal page_count, indexed_count
+            page_count += len(pages)
+            # Shared state is only read here on the event loop; the worker thread gets
+            # just this file's pages, chunk cache and chunker
+            changed_pages = find_changed_pages(pages, indexed_body_hashes)
+            paths = [path for path, _ in pages]
+
+            # Run even when nothing changed, to carry these pages' chunks into the new cache
+            chunk_objects, document_objects = await loop.run_in_executor(
+                None, build_objects, vdb_name, paths, changed_pages, chunk_cache, chunker
             )
+            if document_objects:
+                indexed_count += len(document_objects)
+                await queue.put((chunk_objects, document_objects))
+
+        # Stream url -> markdown pairs rather than loading the whole crawl file,
+        # so memory stays at a few batches of pages regardless of file size
+        pages = []
+        try:
+            with open(crawled_doc_path, "rb") as f:
+                for path, text in ijson.kvitems(f, ""):
+                    pages.append((path, text))
+                    if len(pages) == CHUNK_BATCH_SIZE:
+                        await produce(pages)
+                        pages = []
+
+            if pages:
+                await produce(pages)
+        except BaseException:
+            # Only replace the cache once every page has been carried over
+            chunk_cache.close(save=False)
+            raise
+
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+        await loop.run_in_executor(None, chunk_cache.close, True)
+
+        print(f"Finished indexing {vdb_name}: {indexed_count} of {page_count} pages new or changed")
+
+
+async def load_body_hashes(documents) -> dict[str, str]:
+    return {
+        o.properties["path"]: o.properties["body_hash"]
+        async for o in documents.iterator(return_properties=["path", "body_hash"])
+    }
+
+
+async def main():
+    async with weaviate.use_async_with_local(
+        headers={
+            "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY")
+        },
+    ) as client:
+        chunks = client.collections.use("Chunks")
+        documents = client.collections.use("Documents")
+
+        indexed_body_hashes = await load_body_hashes(documents)
+        print(f"Found {len(indexed_body_hashes)} documents already indexed")
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILES)
+        await asyncio.gather(*[
+            index_file(chunks, documents, crawled_doc_path, semaphore, indexed_body_hashes)
+            for crawled_doc_path in doc_files_dir.glob("*.json")
+        ])
+
 
-client.close()
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,21 +1,27 @@
+import asyncio
 import os
 import weaviate
 from weaviate.classes.generate import GenerativeConfig
 from weaviate.classes.query import Filter
 from typing import Optional
-from utils import PRODUCTS
+from utils import PRODUCTS, document_uuid
 
 
-client = weaviate.connect_to_local(
-    headers={
-        "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY"),
-        "X-Anthropic-Api-Key": os.getenv("ANTHROPIC_API_KEY"),
-    },
-)
+headers = {
+    "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY"),
+    "X-Anthropic-Api-Key": os.getenv("ANTHROPIC_API_KEY"),
+}
+
+client = weaviate.connect_to_local(headers=headers)
 
 chunks = client.collections.use("Chunks")
 documents = client.collections.use("Documents")
 
+# Fetch only the properties each query needs
+CHUNK_PROPERTIES = ["product", "chunk", "chunk_no", "path"]
+DOCUMENT_PROPERTIES = ["product", "body", "path"]
+DOCUMENT_PREVIEW_PROPERTIES = ["product", "body_preview", "path"]
+
 
 rag_config = GenerativeConfig.anthropic(
     # model="claude-haiku-4-5-20251001",
@@ -49,7 +55,8 @@ def search_chunks(query: str, product: Optional[str] = None, limit: int = 5) ->
     response = chunks.query.hybrid(
         query=query,
         limit=limit,
-        filters=filter
+        filters=filter,
+        return_properties=CHUNK_PROPERTIES
     )
     return [o.properties for o in response.objects]
 
@@ -63,19 +70,42 @@ def search_documents(query: str, product: Optional[str] = None, limit: int = 5)
     response = documents.query.hybrid(
         query=query,
         limit=limit,
-        filters=filter
+        filters=filter,
+        return_properties=DOCUMENT_PREVIEW_PROPERTIES
     )
     return [o.properties for o in response.objects]
 
 
-def fetch_document(path: str) -> dict:
-    response = documents.query.fetch_objects(
-        filters=Filter.by_property("path").equal(path),
-        limit=1
+async def search_documents_async(async_documents, query: str, product: Optional[str] = None, limit: int = 5) -> list[dict]:
+    if product:
+        filter = Filter.by_property("product").equal(product)
+    else:
+        filter = None
+
+    response = await async_documents.query.hybrid(
+        query=query,
+        limit=limit,
+        filters=filter,
+        return_properties=DOCUMENT_PREVIEW_PROPERTIES
     )
-    if len(response.objects) == 0:
+    return [o.properties for o in response.objects]
+
+
+async def search_documents_all_products(query: str, limit: int = 5) -> list[list[dict]]:
+    # Searches for each product run concurrently: total wait is the slowest one, not the sum
+    async with weaviate.use_async_with_local(headers=headers) as async_client:
+        async_documents = async_client.collections.use("Documents")
+        return await asyncio.gather(*[
+            search_documents_async(async_documents, query, product=product, limit=limit)
+            for product in PRODUCTS
+        ])
+
+
+def fetch_document(path: str) -> dict:
+    obj = documents.query.fetch_object_by_id(document_uuid(path), return_properties=DOCUMENT_PROPERTIES)
+    if obj is None:
         return None
-    return response.objects[0].properties
+    return obj.properties
 
 
 for tmp_path in [
@@ -97,11 +127,11 @@ for search_query in ["Add documents to the database Python"]:
 
 
 for doc_search_query in ["quickstart guide"]:
-    for product in PRODUCTS:
-        results = search_documents(doc_search_query, product=product, limit=5)
+    all_results = asyncio.run(search_documents_all_products(doc_search_query, limit=5))
+    for product, results in zip(PRODUCTS, all_results):
         for result in results:
             print(f"Document {result['path']} from {product}")
-            print(result["body"][:500] + "...")
+            print(result["body_preview"])
             print()
 
 client.close()
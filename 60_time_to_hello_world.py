@@ -7,8 +7,10 @@ to get a basic "hello world" working (connect, create collection/index, insert,
 Uses the MCP server to search documentation.
 """
 
+import asyncio
 import os
 import json
+import orjson
 from pathlib import Path
 from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStdio
@@ -17,6 +19,12 @@ from pydantic_ai.mcp import MCPServerStdio
 # Products to analyze
 PRODUCTS = ["weaviate", "pinecone", "qdrant", "turbopuffer", "chroma"]
 
+# Fields the summary and report read from every analysis
+REQUIRED_FIELDS = [
+    "product", "steps_count", "pages_count", "code_blocks_count", "estimated_time_minutes",
+    "steps_description", "complexity_rating", "prerequisites", "notes",
+]
+
 # Set up the MCP server connection
 vdb_docs_mcp_directory = Path(__file__).parent
 vdb_docs_mcp_server = MCPServerStdio(
@@ -25,33 +33,49 @@ vdb_docs_mcp_server = MCPServerStdio(
     env=os.environ.copy(),
 )
 
-# Create an agent with access to the vector database documentation MCP
+SYSTEM_PROMPT = """
+You are a documentation analysis expert for vector databases.
+
+Your task is to analyze "time to hello world" - how long it takes a developer
+to get a basic working example that:
+1. Connects to the database
+2. Creates a collection/index
+3. Inserts some vectors/documents
+4. Performs a basic query/search
+
+Use the search tool with kind="documents" to find getting started documentation.
+Then use fetch_document to get full content of the most relevant pages.
+
+Be thorough and objective in your analysis.
+"""
+
+# Create an agent with access to the vector database documentation MCP.
+# The system prompt is static, so it's passed as a plain string rather than
+# rebuilt by a decorated function on every run
 analysis_agent = Agent(
     model="claude-haiku-4-5-20251001",
+    system_prompt=SYSTEM_PROMPT,
     toolsets=[vdb_docs_mcp_server]
 )
 
 
-@analysis_agent.system_prompt
-def set_system_prompt() -> str:
-    return """
-    You are a documentation analysis expert for vector databases.
-
-    Your task is to analyze "time to hello world" - how long it takes a developer
-    to get a basic working example that:
-    1. Connects to the database
-    2. Creates a collection/index
-    3. Inserts some vectors/documents
-    4. Performs a basic query/search
-
-    Use the search_documents tool to find getting started documentation.
-    Then use fetch_document to get full content of the most relevant pages.
-
-    Be thorough and objective in your analysis.
+def extract_json(text: str) -> dict:
+    """
+    Return the first JSON object in the text, with or without surrounding code fences.
     """
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            result, _ = decoder.raw_decode(text, start)
+            return result
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+
+    raise ValueError("No JSON object found in response")
 
 
-def analyze_product(product: str) -> dict:
+async def analyze_product(product: str) -> dict:
     """
     Analyze a single product's documentation for time-to-hello-world metrics.
     """
@@ -60,7 +84,7 @@ def analyze_product(product: str) -> dict:
     Analyze the {product} documentation to determine the "time to hello world".
 
     Steps:
-    1. Use search_documents to find getting started, quickstart, or tutorial pages for {product}
+    1. Use search with kind="documents" to find getting started, quickstart, or tutorial pages for {product}
     2. Use fetch_document to get the full content of the most relevant 3-5 pages
     3. Analyze the documentation and provide a JSON response with these fields:
 
@@ -90,27 +114,18 @@ def analyze_product(product: str) -> dict:
 
     print(f"  Searching and analyzing {product} documentation...")
 
-    try:
-        response = analysis_agent.run_sync(user_prompt=prompt)
-        result_text = response.output
-
-        # Parse JSON from response
-        if "```json" in result_text:
-            json_str = result_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in result_text:
-            json_str = result_text.split("```")[1].split("```")[0].strip()
-        else:
-            json_str = result_text.strip()
+    # Errors propagate to main, which reports them per product
+    response = await analysis_agent.run(user_prompt=prompt)
+    result_text = response.output
 
-        result = json.loads(json_str)
-        return result
+    analysis = extract_json(result_text)
+    missing = [field for field in REQUIRED_FIELDS if field not in analysis]
+    if missing:
+        raise ValueError(f"Analysis is missing fields: {', '.join(missing)}")
+    return analysis
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        raise
 
-
-def main():
+async def main():
     results = []
 
     # Ensure outputs directory exists
@@ -119,27 +134,31 @@ def main():
     print("Analyzing 'Time to Hello World' for vector databases...\n")
     print("Using MCP server for documentation search...\n")
 
-    for product in PRODUCTS:
-        print(f"Analyzing {product}...")
-
-        try:
-            analysis = analyze_product(product)
-            results.append(analysis)
-
-            print(f"  ✓ Steps: {analysis['steps_count']}, "
-                  f"Pages: {analysis['pages_count']}, "
-                  f"Time: ~{analysis['estimated_time_minutes']} min, "
-                  f"Complexity: {analysis['complexity_rating']}/5")
-        except Exception as e:
-            print(f"  ✗ Error analyzing {product}: {e}")
+    # Each analysis is bound by LLM and MCP round trips, so run them all at once.
+    # Entering the agent starts the MCP server once for all of the concurrent runs
+    async with analysis_agent:
+        analyses = await asyncio.gather(
+            *[analyze_product(product) for product in PRODUCTS],
+            return_exceptions=True,
+        )
+
+    for product, analysis in zip(PRODUCTS, analyses):
+        print(f"{product}:")
+        if isinstance(analysis, BaseException):
+            print(f"  ✗ Error analyzing {product}: {analysis}")
             continue
 
-        print()
+        results.append(analysis)
+        print(f"  ✓ Steps: {analysis['steps_count']}, "
+              f"Pages: {analysis['pages_count']}, "
+              f"Time: ~{analysis['estimated_time_minutes']} min, "
+              f"Complexity: {analysis['complexity_rating']}/5")
+
+    print()
 
     # Save results
     output_file = Path("outputs/time_to_hello_world_analysis.json")
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    output_file.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
 
     print(f"\n✓ Analysis complete! Results saved to {output_file}")
 
@@ -160,13 +179,12 @@ def save_code_snippets(results: list[dict]):
             product = r['product']
             snippet_file = snippets_dir / f"{product}_hello_world.py"
 
-            with open(snippet_file, "w") as f:
-                f.write(f"# {product.capitalize()} - Hello World Example\n")
-                if 'code_source_url' in r:
-                    f.write(f"# Source: {r['code_source_url']}\n")
-                f.write(f"# Estimated time: ~{r['estimated_time_minutes']} minutes\n")
-                f.write(f"# Complexity: {r['complexity_rating']}/5\n\n")
-                f.write(r['hello_world_code'])
+            header = f"# {product.capitalize()} - Hello World Example\n"
+            if 'code_source_url' in r:
+                header += f"# Source: {r['code_source_url']}\n"
+            header += f"# Estimated time: ~{r['estimated_time_minutes']} minutes\n"
+            header += f"# Complexity: {r['complexity_rating']}/5\n\n"
+            snippet_file.write_text(header + r['hello_world_code'])
 
             print(f"  ✓ Code snippet saved: {snippet_file}")
 
@@ -177,82 +195,89 @@ def generate_summary_report(results: list[dict]):
     # Sort by estimated time
     sorted_results = sorted(results, key=lambda x: x["estimated_time_minutes"])
 
-    report = "# Time to Hello World Analysis\n\n"
-    report += "Comparison of onboarding complexity across vector databases.\n\n"
-    report += f"*Generated using MCP server for documentation search*\n\n"
-    report += "## Quick Summary\n\n"
-    report += "| Product | Steps | Pages | Time (min) | Complexity |\n"
-    report += "|---------|-------|-------|------------|------------|\n"
-
+    # Collect the pieces and join once, rather than copying the growing report on every +=
+    parts = ["# Time to Hello World Analysis\n\n"]
+    parts.append("Comparison of onboarding complexity across vector databases.\n\n")
+    parts.append(f"*Generated using MCP server for documentation search*\n\n")
+    parts.append("## Quick Summary\n\n")
+    parts.append("| Product | Steps | Pages | Time (min) | Complexity |\n")
+    parts.append("|---------|-------|-------|------------|------------|\n")
+
+    # Gather the complexity extremes and totals in the same pass as the table rows
+    simplest = most_complex = sorted_results[0]
+    total_time = total_steps = 0
     for r in sorted_results:
-        report += f"| {r['product'].capitalize()} | {r['steps_count']} | {r['pages_count']} | {r['estimated_time_minutes']} | {r['complexity_rating']}/5 |\n"
+        parts.append(f"| {r['product'].capitalize()} | {r['steps_count']} | {r['pages_count']} | {r['estimated_time_minutes']} | {r['complexity_rating']}/5 |\n")
+        if r['complexity_rating'] < simplest['complexity_rating']:
+            simplest = r
+        if r['complexity_rating'] > most_complex['complexity_rating']:
+            most_complex = r
+        total_time += r['estimated_time_minutes']
+        total_steps += r['steps_count']
 
-    report += "\n## Key Insights\n\n"
+    parts.append("\n## Key Insights\n\n")
 
     # Find fastest and slowest
     fastest = sorted_results[0]
     slowest = sorted_results[-1]
-    report += f"- **Fastest to get started:** {fastest['product'].capitalize()} (~{fastest['estimated_time_minutes']} min)\n"
-    report += f"- **Most time required:** {slowest['product'].capitalize()} (~{slowest['estimated_time_minutes']} min)\n"
+    parts.append(f"- **Fastest to get started:** {fastest['product'].capitalize()} (~{fastest['estimated_time_minutes']} min)\n")
+    parts.append(f"- **Most time required:** {slowest['product'].capitalize()} (~{slowest['estimated_time_minutes']} min)\n")
 
-    # Find simplest and most complex
-    simplest = min(sorted_results, key=lambda x: x['complexity_rating'])
-    most_complex = max(sorted_results, key=lambda x: x['complexity_rating'])
-    report += f"- **Simplest complexity:** {simplest['product'].capitalize()} ({simplest['complexity_rating']}/5)\n"
-    report += f"- **Highest complexity:** {most_complex['product'].capitalize()} ({most_complex['complexity_rating']}/5)\n"
+    # Simplest and most complex
+    parts.append(f"- **Simplest complexity:** {simplest['product'].capitalize()} ({simplest['complexity_rating']}/5)\n")
+    parts.append(f"- **Highest complexity:** {most_complex['product'].capitalize()} ({most_complex['complexity_rating']}/5)\n")
 
     # Average stats
-    avg_time = sum(r['estimated_time_minutes'] for r in sorted_results) / len(sorted_results)
-    avg_steps = sum(r['steps_count'] for r in sorted_results) / len(sorted_results)
-    report += f"- **Average time to hello world:** ~{avg_time:.1f} minutes\n"
-    report += f"- **Average number of steps:** {avg_steps:.1f}\n\n"
+    avg_time = total_time / len(sorted_results)
+    avg_steps = total_steps / len(sorted_results)
+    parts.append(f"- **Average time to hello world:** ~{avg_time:.1f} minutes\n")
+    parts.append(f"- **Average number of steps:** {avg_steps:.1f}\n\n")
 
-    report += "\n## Detailed Analysis\n\n"
+    parts.append("\n## Detailed Analysis\n\n")
 
     for r in sorted_results:
-        report += f"### {r['product'].capitalize()}\n\n"
-        report += f"**Complexity Rating:** {r['complexity_rating']}/5  \n"
-        report += f"**Estimated Time:** ~{r['estimated_time_minutes']} minutes  \n"
-        report += f"**Pages to Visit:** {r['pages_count']}  \n"
-        report += f"**Code Examples Needed:** {r['code_blocks_count']}  \n\n"
+        parts.append(f"### {r['product'].capitalize()}\n\n")
+        parts.append(f"**Complexity Rating:** {r['complexity_rating']}/5  \n")
+        parts.append(f"**Estimated Time:** ~{r['estimated_time_minutes']} minutes  \n")
+        parts.append(f"**Pages to Visit:** {r['pages_count']}  \n")
+        parts.append(f"**Code Examples Needed:** {r['code_blocks_count']}  \n\n")
 
-        report += "**Prerequisites:**\n"
+        parts.append("**Prerequisites:**\n")
         for prereq in r['prerequisites']:
-            report += f"- {prereq}\n"
-        report += "\n"
+            parts.append(f"- {prereq}\n")
+        parts.append("\n")
 
-        report += "**Steps:**\n"
+        parts.append("**Steps:**\n")
         for i, step in enumerate(r['steps_description'], 1):
-            report += f"{i}. {step}\n"
-        report += "\n"
+            parts.append(f"{i}. {step}\n")
+        parts.append("\n")
 
         # Add code snippet
         if 'hello_world_code' in r:
-            report += "**Hello World Code:**\n\n"
+            parts.append("**Hello World Code:**\n\n")
             # Detect language from product or use python as default
             lang = "python"
-            report += f"```{lang}\n{r['hello_world_code']}\n```\n\n"
+            parts.append(f"```{lang}\n{r['hello_world_code']}\n```\n\n")
             if 'code_source_url' in r:
-                report += f"*Source: {r['code_source_url']}*\n\n"
+                parts.append(f"*Source: {r['code_source_url']}*\n\n")
 
-        report += f"**Notes:** {r['notes']}\n\n"
+        parts.append(f"**Notes:** {r['notes']}\n\n")
 
         # Add analyzed documents
         if 'analyzed_documents' in r:
-            report += "**Documentation References:**\n"
+            parts.append("**Documentation References:**\n")
             for doc_path in r['analyzed_documents']:
-                report += f"- {doc_path}\n"
-            report += "\n"
+                parts.append(f"- {doc_path}\n")
+            parts.append("\n")
 
-        report += "---\n\n"
+        parts.append("---\n\n")
 
     # Save report
     report_file = Path("outputs/time_to_hello_world_report.md")
-    with open(report_file, "w") as f:
-        f.write(report)
+    report_file.write_text("".join(parts))
 
     print(f"✓ Summary report saved to {report_file}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
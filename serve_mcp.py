@@ -1,40 +1,124 @@
+import asyncio
+import math
 import os
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import cohere
+import orjson
 import weaviate
+from weaviate.classes.init import AdditionalConfig
 from weaviate.classes.query import Filter
+from weaviate.config import ConnectionConfig
+from weaviate.collections import CollectionAsync
 from fastmcp import FastMCP
-from utils import PRODUCTS
-from typing import Optional
+from fastmcp.exceptions import ToolError
+from utils import PRODUCTS, EMBED_MODEL, document_uuid
+from time import monotonic
+from typing import Any, Literal, Optional
 
 
-# Initialize FastMCP server
-mcp = FastMCP("vdb-docs")
-
 # Available products as a formatted string for descriptions
 PRODUCTS_LIST = ", ".join(PRODUCTS)
 
+# Fetch only the properties the tools return, and never vectors
+CHUNK_PROPERTIES = ["product", "chunk", "chunk_no", "path"]
+DOCUMENT_PROPERTIES = ["product", "body", "path"]
+DOCUMENT_PREVIEW_PROPERTIES = ["product", "body_preview", "path"]
+
+
+# Shared across tool calls so each call doesn't pay for a new connection
+# (gRPC/HTTP handshakes, schema fetch); created on first use, along with the
+# collection handles the tools query. The async client lets concurrent tool
+# calls overlap their Weaviate round trips on the server's event loop
+_client: Optional[weaviate.WeaviateAsyncClient] = None
+_chunks: Optional[CollectionAsync] = None
+_documents: Optional[CollectionAsync] = None
+# Concurrent first calls must not each connect
+_client_lock = asyncio.Lock()
+
+# FastMCP runs async tool calls concurrently (and search_chunks_batch fans out), so
+# cap the queries in flight to avoid overwhelming Weaviate during bursts
+MAX_CONCURRENT_QUERIES = 16
+_query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+# Keep enough idle HTTP connections alive for bursts of concurrent tool calls, so
+# they reuse connections instead of reconnecting once the keep-alive pool overflows.
+# gRPC queries share one multiplexed channel and need no pool
+CONNECTION_CONFIG = ConnectionConfig(
+    session_pool_connections=32,
+    session_pool_maxsize=100,
+)
+
+
+async def get_weaviate_client() -> weaviate.WeaviateAsyncClient:
+    """Return the shared Weaviate client with API keys, connecting on first use."""
+    global _client, _chunks, _documents
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                client = weaviate.use_async_with_local(
+                    headers={
+                        "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY"),
+                        "X-Anthropic-Api-Key": os.getenv("ANTHROPIC_API_KEY"),
+                    },
+                    additional_config=AdditionalConfig(connection=CONNECTION_CONFIG),
+                )
+                await client.connect()
+                _chunks = client.collections.use("Chunks")
+                _documents = client.collections.use("Documents")
+                # Publish the client last, so callers that skip the lock never see it half set up
+                _client = client
+    return _client
+
+
+async def get_chunks_collection() -> CollectionAsync:
+    await get_weaviate_client()
+    return _chunks
+
+
+async def get_documents_collection() -> CollectionAsync:
+    await get_weaviate_client()
+    return _documents
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Connect the shared Weaviate client at startup and close it on shutdown."""
+    global _client, _chunks, _documents
+    # Connect up front so the first tool call doesn't pay for the handshake. If
+    # Weaviate isn't reachable yet, tool calls retry the connection lazily.
+    # stdout carries the stdio transport, so report on stderr
+    try:
+        await get_weaviate_client()
+    except Exception as e:
+        print(f"Could not connect to Weaviate at startup: {e}", file=sys.stderr)
+
+    try:
+        yield
+    finally:
+        if _client is not None:
+            await _client.close()
+            _client = _chunks = _documents = None
+
 
-def get_weaviate_client():
-    """Create and return a Weaviate client with API keys."""
-    return weaviate.connect_to_local(
-        headers={
-            "X-Cohere-Api-Key": os.getenv("COHERE_API_KEY"),
-            "X-Anthropic-Api-Key": os.getenv("ANTHROPIC_API_KEY"),
-        },
-    )
+def serialize_tool_result(data) -> str:
+    # orjson encodes the result dicts several times faster than FastMCP's default
+    # serializer; FastMCP falls back to the default if this raises
+    return orjson.dumps(data).decode()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("vdb-docs", lifespan=lifespan, tool_serializer=serialize_tool_result)
 
 
 # ============================================================================
 # Prompts (Usage Instructions)
 # ============================================================================
 
-@mcp.prompt()
-def vdb_assistant_prompt() -> str:
-    """System prompt for AI assistants using vector database documentation tools.
+# Prompt texts are built once at import; PRODUCTS_LIST never changes while the server runs
 
-    Provides guidance on how to effectively use the documentation search tools
-    and cite sources properly.
-    """
-    return f"""You are a helpful assistant for vector database documentation.
+VDB_ASSISTANT_PROMPT = f"""You are a helpful assistant for vector database documentation.
 You have good general knowledge of how vector databases work.
 
 However, you are keenly aware that your knowledge may be outdated.
@@ -56,10 +140,10 @@ Examples:
 - [Setting up RBAC in Weaviate](https://docs.weaviate.io/deploy/tutorials/rbac)
 
 **Available Tools:**
-- search_chunks: Find specific code examples or explanations
-- search_documents: Search complete documentation pages
-- search_weaviate_chunks: Weaviate-specific chunk search
-- search_weaviate_documents: Weaviate-specific document search
+- search: Find specific code examples or explanations (kind="chunks"),
+  or search complete documentation pages (kind="documents")
+- search_chunks_batch: Run several chunk searches in one call
+- search_weaviate: Weaviate-specific search (chunks or documents)
 
 **Available Resources:**
 - vdb-doc://<url>: Fetch complete documentation by URL
@@ -68,19 +152,23 @@ Examples:
 
 
 @mcp.prompt()
-def weaviate_assistant_prompt() -> str:
-    """System prompt for AI assistants focused on Weaviate documentation.
+def vdb_assistant_prompt() -> str:
+    """System prompt for AI assistants using vector database documentation tools.
 
-    Specialized version for Weaviate-specific queries with optimized tool usage.
+    Provides guidance on how to effectively use the documentation search tools
+    and cite sources properly.
     """
-    return """You are a Weaviate documentation expert and helpful assistant.
+    return VDB_ASSISTANT_PROMPT
+
+
+WEAVIATE_ASSISTANT_PROMPT = """You are a Weaviate documentation expert and helpful assistant.
 
 You have good general knowledge of Weaviate but are keenly aware that your
 knowledge may be outdated. You have access to the latest Weaviate documentation
 and should actively use it.
 
 **Recommended Approach:**
-1. Use search_weaviate_documents or search_weaviate_chunks for broad searches
+1. Use search_weaviate (kind="documents" or kind="chunks") for broad searches
 2. Use weaviate-doc:// resources to fetch complete documentation pages
 3. Always cite sources using: [<DOCUMENT_TITLE>](<SOURCE_URL>)
 
@@ -88,8 +176,8 @@ and should actively use it.
 [Basic collection operations](https://docs.weaviate.io/weaviate/manage-collections/collection-operations)
 
 **Tool Usage:**
-- For specific code examples: search_weaviate_chunks
-- For conceptual information: search_weaviate_documents
+- For specific code examples: search_weaviate with kind="chunks"
+- For conceptual information: search_weaviate with kind="documents"
 - To read full pages: weaviate-doc://<path>
 
 Always prioritize the latest documentation over your internal knowledge.
@@ -97,12 +185,15 @@ Always prioritize the latest documentation over your internal knowledge.
 
 
 @mcp.prompt()
-def code_generation_prompt() -> str:
-    """System prompt for generating code examples from vector database documentation.
+def weaviate_assistant_prompt() -> str:
+    """System prompt for AI assistants focused on Weaviate documentation.
 
-    Optimized for creating working code snippets with proper citations.
+    Specialized version for Weaviate-specific queries with optimized tool usage.
     """
-    return f"""You are an expert at generating working code examples for vector databases.
+    return WEAVIATE_ASSISTANT_PROMPT
+
+
+CODE_GENERATION_PROMPT = f"""You are an expert at generating working code examples for vector databases.
 
 **Your Process:**
 1. Search documentation for relevant code examples and API references
@@ -124,7 +215,7 @@ Always cite documentation sources:
 [<DOCUMENT_TITLE>](<SOURCE_URL>)
 
 **Example Flow:**
-1. Use search_chunks to find API examples
+1. Use search (kind="chunks") to find API examples
 2. Use vdb-doc:// resources to read full documentation pages
 3. Generate code based on official examples
 4. Cite all sources used
@@ -132,12 +223,15 @@ Always cite documentation sources:
 
 
 @mcp.prompt()
-def comparative_analysis_prompt() -> str:
-    """System prompt for comparing vector database features and approaches.
+def code_generation_prompt() -> str:
+    """System prompt for generating code examples from vector database documentation.
 
-    Guides assistants to perform fair, documentation-based comparisons.
+    Optimized for creating working code snippets with proper citations.
     """
-    return f"""You are an expert at comparing vector database technologies.
+    return CODE_GENERATION_PROMPT
+
+
+COMPARATIVE_ANALYSIS_PROMPT = f"""You are an expert at comparing vector database technologies.
 
 **Your Goal:**
 Provide fair, accurate comparisons based on the latest documentation.
@@ -173,126 +267,281 @@ Be objective and base all claims on documentation.
 """
 
 
+@mcp.prompt()
+def comparative_analysis_prompt() -> str:
+    """System prompt for comparing vector database features and approaches.
+
+    Guides assistants to perform fair, documentation-based comparisons.
+    """
+    return COMPARATIVE_ANALYSIS_PROMPT
+
+
 # ============================================================================
 # General Tools (All Vector Databases)
 # ============================================================================
 
 
-def search_chunks_generic(query: str, limit: int, product: Optional[str] = None) -> list[dict]:
-    client = get_weaviate_client()
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (monotonic(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Upper bound on results per search, whatever limit the model asks for
+MAX_SEARCH_LIMIT = 50
+# Upper bound on queries per search_chunks_batch call, since each is a full search
+MAX_BATCH_QUERIES = 10
+
+# Agents often repeat a search within a session; serve those from memory rather than
+# running the hybrid search (embedding call + BM25 + HNSW) again. The TTL lets
+# re-indexed docs show up without a restart
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL_S = 300
+_chunk_search_cache = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_S)
+_document_search_cache = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_S)
+
+
+# Embedding the query is the most expensive step of a hybrid search, so queries are
+# embedded here (with the vectorizer's model) and the vectors passed to Weaviate,
+# letting repeat queries skip the Cohere round trip. Embeddings never go stale
+EMBED_CACHE_SIZE = 1024
+_embed_cache = TTLCache(EMBED_CACHE_SIZE, math.inf)
+# Bursts of tool calls (or a batch) would otherwise hit Cohere all at once and risk 429s
+MAX_CONCURRENT_EMBEDS = 4
+_embed_semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDS)
+_cohere: Optional[cohere.AsyncClientV2] = None
+
+
+async def embed_query(query: str) -> list[float]:
+    global _cohere
+    cache_key = (EMBED_MODEL, query)
+    vector = _embed_cache.get(cache_key)
+    if vector is not None:
+        return vector
+
+    if _cohere is None:
+        _cohere = cohere.AsyncClientV2(api_key=os.getenv("COHERE_API_KEY"))
+
+    async with _embed_semaphore:
+        response = await _cohere.embed(
+            texts=[query],
+            model=EMBED_MODEL,
+            input_type="search_query",
+            embedding_types=["float"],
+        )
+    vector = response.embeddings.float_[0]
+    _embed_cache.set(cache_key, vector)
+    return vector
 
-    try:
-        chunks = client.collections.use("Chunks")
 
-        filter_obj = Filter.by_property("product").equal(product) if product else None
+# Products are a fixed list, so their filters are built once
+PRODUCT_FILTERS = {product: Filter.by_property("product").equal(product) for product in PRODUCTS}
 
-        response = chunks.query.hybrid(
-            query=query,
-            limit=limit,
-            filters=filter_obj
-        )
 
-        results = [o.properties for o in response.objects]
-        return results
+def normalize_product(product: Optional[str]) -> Optional[str]:
+    # Models vary the casing and spacing of product names; an empty name means no filter
+    return (product.strip().lower() or None) if product else None
 
-    finally:
-        client.close()
 
+def product_filter(product: Optional[str]):
+    return PRODUCT_FILTERS[product] if product else None
 
-@mcp.tool()
-def search_chunks(query: str, product: Optional[str] = None, limit: int = 5) -> list[dict]:
-    """Search for relevant text chunks across vector database documentation.
 
-    Returns smaller chunks of text that match the query, useful for finding
-    specific code examples or explanations.
+def search_cache_key(query: str, limit: int, product: Optional[str]) -> tuple:
+    # Queries differing only in whitespace share an entry
+    return " ".join(query.split()), limit, product
 
-    Args:
-        query: The search query or question
-        product: Optional filter by specific product. Available: weaviate, turbopuffer,
-                pinecone, milvus, qdrant, chroma, pgvector
-        limit: Number of chunks to retrieve (default: 5)
 
-    Returns:
-        List of matching chunks with product, chunk text, chunk number, and source path
-    """
-    return search_chunks_generic(query=query, limit=limit, product=product)
+def copy_results(results: list[dict]) -> list[dict]:
+    # Results are flat dicts; copy them so callers can't modify cached entries
+    return [dict(r) for r in results]
 
 
-def search_documents_generic(query: str, limit: int, product: Optional[str] = None) -> list[dict]:
-    client = get_weaviate_client()
-    try:
-        documents = client.collections.use("Documents")
-        filter_obj = Filter.by_property("product").equal(product) if product else None
-        response = documents.query.hybrid(
+def prepare_search(query: str, limit: int, product: Optional[str]) -> Optional[tuple[int, Optional[str], tuple]]:
+    """Normalize search arguments to (limit, product, cache_key), or None if nothing can match."""
+    # The limit comes from the model, so keep it to a sane page size
+    limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+    product = normalize_product(product)
+    if product is not None and product not in PRODUCT_FILTERS:
+        # An unknown product can't match anything, so skip the round trip
+        return None
+    return limit, product, search_cache_key(query, limit, product)
+
+
+async def search_chunks_generic(query: str, limit: int, product: Optional[str] = None) -> list[dict]:
+    prepared = prepare_search(query, limit, product)
+    if prepared is None:
+        return []
+    limit, product, cache_key = prepared
+
+    cached = _chunk_search_cache.get(cache_key)
+    if cached is not None:
+        return copy_results(cached)
+
+    chunks = await get_chunks_collection()
+
+    filter_obj = product_filter(product)
+
+    vector = await embed_query(query)
+    async with _query_semaphore:
+        response = await chunks.query.hybrid(
             query=query,
+            vector=vector,
             limit=limit,
-            filters=filter_obj
+            filters=filter_obj,
+            return_properties=CHUNK_PROPERTIES,
+            include_vector=False,
         )
-        results = [o.properties for o in response.objects]
-        for result in results:
-            result["body"] = result["body"][:500] + "..."
-        return results
-    finally:
-        client.close()
 
+    results = [o.properties for o in response.objects]
+    _chunk_search_cache.set(cache_key, results)
+    return copy_results(results)
+
+
+async def search_documents_generic(query: str, limit: int, product: Optional[str] = None) -> list[dict]:
+    prepared = prepare_search(query, limit, product)
+    if prepared is None:
+        return []
+    limit, product, cache_key = prepared
+
+    cached = _document_search_cache.get(cache_key)
+    if cached is not None:
+        return copy_results(cached)
+
+    documents = await get_documents_collection()
+    filter_obj = product_filter(product)
+    vector = await embed_query(query)
+    async with _query_semaphore:
+        response = await documents.query.hybrid(
+            query=query,
+            vector=vector,
+            limit=limit,
+            filters=filter_obj,
+            return_properties=DOCUMENT_PREVIEW_PROPERTIES,
+            include_vector=False,
+        )
+    # Previews are stored at ingest, so full bodies never cross the wire here
+    results = [
+        {
+            "product": o.properties["product"],
+            "body": o.properties["body_preview"],
+            "path": o.properties["path"],
+        }
+        for o in response.objects
+    ]
+    _document_search_cache.set(cache_key, results)
+    return copy_results(results)
 
-@mcp.tool()
-def search_documents(query: str, limit: int = 5, product: Optional[str] = None) -> list[dict]:
-    """Search for complete documentation pages across vector databases.
 
-    Returns the first 500 characters of documents that match the query.
-    Use the vdb-doc:// resource URI to get the full content of a specific document.
+async def search_generic(query: str, kind: str, limit: int, product: Optional[str] = None) -> list[dict]:
+    if kind == "documents":
+        return await search_documents_generic(query=query, limit=limit, product=product)
+    return await search_chunks_generic(query=query, limit=limit, product=product)
+
+
+@mcp.tool()
+async def search(
+    query: str,
+    kind: Literal["chunks", "documents"] = "chunks",
+    product: Optional[str] = None,
+    limit: int = 5,
+) -> list[dict]:
+    """Search vector database documentation.
+
+    kind="chunks" returns smaller chunks of text, useful for finding specific code
+    examples or explanations. kind="documents" returns the first 500 characters of
+    complete documentation pages; use the vdb-doc:// resource URI to get the full
+    content of a specific document.
 
     Args:
         query: The search query or question
-        limit: Number of documents to retrieve (default: 5)
+        kind: "chunks" (default) or "documents"
         product: Optional filter by specific product. Available: weaviate, turbopuffer,
                 pinecone, milvus, qdrant, chroma, pgvector
+        limit: Number of results to retrieve (default: 5, clamped to 1-50)
 
     Returns:
-        List of matching documents with product, body preview (500 chars), and full path
+        List of matches: chunks with product, chunk text, chunk number, and source path,
+        or documents with product, body preview (500 chars), and full path
     """
-    return search_documents_generic(query=query, limit=limit, product=product)
+    return await search_generic(query=query, kind=kind, limit=limit, product=product)
 
 
-# ============================================================================
-# Weaviate-Specific Tools
-# ============================================================================
-
 @mcp.tool()
-def search_weaviate_chunks(query: str, limit: int = 5) -> list[dict]:
-    """Search for relevant text chunks specifically in Weaviate documentation.
+async def search_chunks_batch(queries: list[str], product: Optional[str] = None, limit: int = 5) -> list[list[dict]]:
+    """Run several chunk searches at once across vector database documentation.
 
-    Convenience function that searches only Weaviate docs. Returns smaller chunks
-    of text that match the query, useful for finding specific code examples or
-    explanations about Weaviate.
+    Use this instead of repeated search calls when you need results for
+    several queries, e.g. the same feature in different products.
 
     Args:
-        query: The search query or question about Weaviate
-        limit: Number of chunks to retrieve (default: 5)
+        queries: The search queries or questions (at most 10)
+        product: Optional filter by specific product. Available: weaviate, turbopuffer,
+                pinecone, milvus, qdrant, chroma, pgvector
+        limit: Number of chunks to retrieve per query (default: 5, clamped to 1-50)
 
     Returns:
-        List of matching Weaviate chunks with chunk text, chunk number, and source path
+        One list of matching chunks per query, in the same order as the queries
     """
-    return search_chunks_generic(query=query, limit=limit, product="weaviate")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ToolError(f"At most {MAX_BATCH_QUERIES} queries per batch; got {len(queries)}")
 
+    # The searches share one connection and run concurrently, so the batch takes
+    # about as long as its slowest query
+    return await asyncio.gather(*[
+        search_chunks_generic(query=query, limit=limit, product=product) for query in queries
+    ])
 
-@mcp.tool()
-def search_weaviate_documents(query: str, limit: int = 5) -> list[dict]:
-    """Search for complete documentation pages specifically in Weaviate documentation.
 
-    Convenience function that searches only Weaviate docs. Returns the first 500
-    characters of documents that match the query. Use the vdb-doc:// resource URI
-    to get the full content of a specific document.
+# ============================================================================
+# Weaviate-Specific Tools
+# ============================================================================
+
+@mcp.tool()
+async def search_weaviate(
+    query: str,
+    kind: Literal["chunks", "documents"] = "chunks",
+    limit: int = 5,
+) -> list[dict]:
+    """Search specifically in Weaviate documentation.
+
+    Convenience function that searches only Weaviate docs. kind="chunks" returns
+    smaller chunks of text, useful for finding specific code examples or
+    explanations about Weaviate. kind="documents" returns the first 500 characters
+    of complete pages; use the vdb-doc:// resource URI to get the full content.
 
     Args:
         query: The search query or question about Weaviate
-        limit: Number of documents to retrieve (default: 5)
+        kind: "chunks" (default) or "documents"
+        limit: Number of results to retrieve (default: 5, clamped to 1-50)
 
     Returns:
-        List of matching Weaviate documents with body preview (500 chars) and full path
+        List of matching Weaviate chunks (chunk text, chunk number, and source path)
+        or documents (body preview (500 chars) and full path)
     """
-    return search_documents_generic(query=query, limit=limit, product="weaviate")
+    return await search_generic(query=query, kind=kind, limit=limit, product="weaviate")
 
 
 # ============================================================================
@@ -300,29 +549,46 @@ def search_weaviate_documents(query: str, limit: int = 5) -> list[dict]:
 # ============================================================================
 
 
-def fetch_document_resource_generic(url: str) -> str:
-    client = get_weaviate_client()
+# Prefix for short paths passed to weaviate-doc://
+WEAVIATE_DOCS_BASE_URL = "https://docs.weaviate.io/"
 
-    try:
-        documents = client.collections.use("Documents")
+# Docs rarely change, so repeat fetches of a page are served from memory (least
+# recently used pages are evicted first); the TTL picks up re-indexed pages within
+# the hour. Misses aren't cached
+DOCUMENT_CACHE_SIZE = 256
+DOCUMENT_CACHE_TTL_S = 3600
+_document_cache = TTLCache(DOCUMENT_CACHE_SIZE, DOCUMENT_CACHE_TTL_S)
 
-        response = documents.query.fetch_objects(
-            filters=Filter.by_property("path").equal(url),
-            limit=1
+
+async def fetch_document_resource_generic(url: str) -> str:
+    document = _document_cache.get(url)
+    if document is not None:
+        return document
+
+    documents = await get_documents_collection()
+
+    # Documents are stored under an id derived from their URL, so this is a
+    # primary-key lookup rather than a filtered query
+    async with _query_semaphore:
+        obj = await documents.query.fetch_object_by_id(
+            document_uuid(url),
+            return_properties=DOCUMENT_PROPERTIES,
+            include_vector=False,
         )
 
-        if len(response.objects) == 0:
-            return f"Error: Document not found at path: {url}"
+    if obj is None:
+        return f"Error: Document not found at path: {url}"
 
-        doc = response.objects[0].properties
-        return f"# {doc['path']}\n\nProduct: {doc['product']}\n\n{doc['body']}"
+    doc = obj.properties
+    document = f"# {doc['path']}\n\nProduct: {doc['product']}\n\n{doc['body']}"
 
-    finally:
-        client.close()
+    _document_cache.set(url, document)
+
+    return document
 
 
 @mcp.resource("vdb-doc://{url}")
-def fetch_document_resource(url: str) -> str:
+async def fetch_document_resource(url: str) -> str:
     """Fetch a complete documentation page by its URL.
 
     This resource provides access to full documentation content using a URI scheme.
@@ -337,11 +603,11 @@ def fetch_document_resource(url: str) -> str:
     Returns:
         Full markdown content of the documentation page
     """
-    return fetch_document_resource_generic(url=url)
+    return await fetch_document_resource_generic(url=url)
 
 
 @mcp.resource("weaviate-doc://{path}")
-def fetch_weaviate_document_resource(path: str) -> str:
+async def fetch_weaviate_document_resource(path: str) -> str:
     """Fetch a complete Weaviate documentation page by its path.
 
     Convenience resource for accessing Weaviate documentation. You can provide
@@ -359,10 +625,8 @@ def fetch_weaviate_document_resource(path: str) -> str:
         Full markdown content of the Weaviate documentation page
     """
     # Handle both full URLs and partial paths
-    if not path.startswith("http"):
-        path = f"https://docs.weaviate.io/{path}"
-
-    return fetch_document_resource_generic(url=path)
+    url = path if path.startswith("http") else WEAVIATE_DOCS_BASE_URL + path
+    return await fetch_document_resource_generic(url=url)
 
 
 if __name__ == "__main__":
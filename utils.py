@@ -1,3 +1,15 @@
+from weaviate.util import generate_uuid5
+
 CRAWLED_DOCS_DIR ="./crawled_docs"
 PROCESSED_DOCS_DIR = "./crawled_docs_processed"
+CHUNKED_DOCS_DIR = "./chunked_docs"
 PRODUCTS = ["weaviate", "turbopuffer", "pinecone", "milvus", "qdrant", "chroma", "pgvector"]
+# Characters of each document stored separately as a preview for search results
+BODY_PREVIEW_CHARS = 500
+# Cohere model used both to vectorize at ingest and to embed search queries
+EMBED_MODEL = "embed-v4.0"
+
+
+def document_uuid(path: str) -> str:
+    """Deterministic Documents object id, so a page can be fetched by URL without a filter."""
+    return generate_uuid5(path, "Documents")